@@ -9,6 +9,8 @@
     :license: BSD, see LICENSE for details.
 """
 
+import re
+
 from pygments.formatter import Formatter
 from pygments.util import get_int_opt, _surrogatepair
 
@@ -16,6 +18,43 @@ from pygments.util import get_int_opt, _surrogatepair
 __all__ = ['RtfFormatter']
 
 
+class _RtfEscapeTable(dict):
+    """
+    Translation table for ``unicode.translate`` that escapes RTF control
+    characters.  Escapes for non-ASCII characters are computed on first use
+    and stored in the table, so repeated characters cost a single lookup.
+    """
+
+    def __init__(self):
+        dict.__init__(self, ((cn, cn) for cn in range(2**7)))
+        self.update({
+            ord(u'\\'): u'\\\\',
+            ord(u'{'): u'\\{',
+            ord(u'}'): u'\\}',
+            ord(u'\n'): u'\\par\n',
+        })
+
+    def __missing__(self, cn):
+        if cn < (2**16):
+            # single unicode escape sequence
+            esc = u'{\\u%d}' % cn
+        else:
+            # RTF limits unicode to 16 bits.
+            # Force surrogate pairs
+            esc = u'{\\u%d}{\\u%d}' % _surrogatepair(cn)
+        self[cn] = esc
+        return esc
+
+
+# characters that need escaping; text without any is output unchanged
+_special_re = re.compile(u'[^\x00-\x7f]|[\\\\{}\n]')
+
+_hexdigits = '0123456789abcdefABCDEF'
+
+# value of every two-digit hex string, for converting style colors
+_hex2int = dict((a + b, int(a + b, 16)) for a in _hexdigits for b in _hexdigits)
+
+
 class RtfFormatter(Formatter):
     """
     Format tokens as RTF markup. This formatter automatically outputs full RTF
@@ -63,43 +102,30 @@ class RtfFormatter(Formatter):
         Formatter.__init__(self, **options)
         self.fontface = options.get('fontface') or ''
         self.fontsize = get_int_opt(options, 'fontsize', 0)
+        self._trans = _RtfEscapeTable()
 
-    def _escape(self, text):
+    @staticmethod
+    def _escape(text):
+        # only used for the header; token text goes through _escape_text
         return text.replace(u'\\', u'\\\\') \
                    .replace(u'{', u'\\{') \
                    .replace(u'}', u'\\}')
 
     def _escape_text(self, text):
-        # empty strings, should give a small performance improvment
-        if not text:
-            return u''
-
-        # escape text
-        text = self._escape(text)
-
-        buf = []
-        for c in text:
-            cn = ord(c)
-            if cn < (2**7):
-                # ASCII character
-                buf.append(str(c))
-            elif (2**7) <= cn < (2**16):
-                # single unicode escape sequence
-                buf.append(u'{\\u%d}' % cn)
-            elif (2**16) <= cn:
-                # RTF limits unicode to 16 bits.
-                # Force surrogate pairs
-                buf.append(u'{\\u%d}{\\u%d}' % _surrogatepair(cn))
-
-        return u''.join(buf).replace(u'\n', u'\\par\n')
+        # empty strings and most plain code need no escaping at all
+        if not text or not _special_re.search(text):
+            return text
+        return text.translate(self._trans)
 
     def format_unencoded(self, tokensource, outfile):
+        write = outfile.write
+
         # rtf 1.8 header
-        outfile.write(u'{\\rtf1\\ansi\\uc0\\deff0'
-                      u'{\\fonttbl{\\f0\\fmodern\\fprq1\\fcharset0%s;}}'
-                      u'{\\colortbl;' % (self.fontface and
-                                         u' ' + self._escape(self.fontface) or
-                                         u''))
+        write(u'{\\rtf1\\ansi\\uc0\\deff0'
+              u'{\\fonttbl{\\f0\\fmodern\\fprq1\\fcharset0%s;}}'
+              u'{\\colortbl;' % (self.fontface and
+                                 u' ' + self._escape(self.fontface) or
+                                 u''))
 
         # convert colors and save them in a mapping to access them later.
         color_mapping = {}
@@ -108,21 +134,30 @@ class RtfFormatter(Formatter):
             for color in style['color'], style['bgcolor'], style['border']:
                 if color and color not in color_mapping:
                     color_mapping[color] = offset
-                    outfile.write(u'\\red%d\\green%d\\blue%d;' % (
-                        int(color[0:2], 16),
-                        int(color[2:4], 16),
-                        int(color[4:6], 16)
+                    write(u'\\red%d\\green%d\\blue%d;' % (
+                        _hex2int[color[0:2]],
+                        _hex2int[color[2:4]],
+                        _hex2int[color[4:6]]
                     ))
                     offset += 1
-        outfile.write(u'}\\f0 ')
+        write(u'}\\f0 ')
         if self.fontsize:
-            outfile.write(u'\\fs%d' % (self.fontsize))
-
-        # highlight stream
-        for ttype, value in tokensource:
-            while not self.style.styles_token(ttype) and ttype.parent:
-                ttype = ttype.parent
-            style = self.style.style_for_token(ttype)
+            write(u'\\fs%d' % (self.fontsize))
+
+        # bind frequently used attributes to locals for the token loop
+        styles = self.style
+        style_for_token = styles.style_for_token
+        escape = self._escape_text
+        # the group markup refers to this run's color table numbering, so
+        # it is only cached for the current run
+        prefix_cache = {}
+        get_cached = prefix_cache.get
+
+        def get_prefix(ttype):
+            tt = ttype
+            while not styles.styles_token(tt) and tt.parent:
+                tt = tt.parent
+            style = style_for_token(tt)
             buf = []
             if style['bgcolor']:
                 buf.append(u'\\cb%d' % color_mapping[style['bgcolor']])
@@ -139,9 +174,23 @@ class RtfFormatter(Formatter):
                            color_mapping[style['border']])
             start = u''.join(buf)
             if start:
-                outfile.write(u'{%s ' % start)
-            outfile.write(self._escape_text(value))
-            if start:
-                outfile.write(u'}')
-
-        outfile.write(u'}')
+                prefix = (u'{' + start + u' ', u'}')
+            else:
+                prefix = (u'', u'')
+            prefix_cache[ttype] = prefix
+            return prefix
+
+        # highlight stream, collecting the output in chunks to save on
+        # small writes
+        parts = []
+        parts_append = parts.append
+        for ttype, value in tokensource:
+            start, end = get_cached(ttype) or get_prefix(ttype)
+            parts_append(start)
+            parts_append(escape(value))
+            parts_append(end)
+            if len(parts) > 4096:
+                write(u''.join(parts))
+                del parts[:]
+        parts_append(u'}')
+        write(u''.join(parts))
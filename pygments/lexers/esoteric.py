@@ -9,7 +9,9 @@
     :license: BSD, see LICENSE for details.
 """
 
-from pygments.lexer import RegexLexer, include, words
+import re
+
+from pygments.lexer import Lexer, RegexLexer, words
 from pygments.token import Text, Comment, Operator, Keyword, Name, String, \
     Number, Punctuation, Error
 
@@ -17,7 +19,7 @@ __all__ = ['BrainfuckLexer', 'BefungeLexer', 'RedcodeLexer', 'CAmkESLexer',
     'CapDLLexer', 'AheuiLexer']
 
 
-class BrainfuckLexer(RegexLexer):
+class BrainfuckLexer(Lexer):
     """
     Lexer for the esoteric `BrainFuck <http://www.muppetlabs.com/~breadbox/bf/>`_
     language.
@@ -28,28 +30,32 @@ class BrainfuckLexer(RegexLexer):
     filenames = ['*.bf', '*.b']
     mimetypes = ['application/x-brainfuck']
 
-    tokens = {
-        'common': [
-            # use different colors for different instruction types
-            (r'[.,]+', Name.Tag),
-            (r'[+-]+', Name.Builtin),
-            (r'[<>]+', Name.Variable),
-            (r'[^.,+\-<>\[\]]+', Comment),
-        ],
-        'root': [
-            (r'\[', Keyword, 'loop'),
-            (r'\]', Error),
-            include('common'),
-        ],
-        'loop': [
-            (r'\[', Keyword, '#push'),
-            (r'\]', Keyword, '#pop'),
-            include('common'),
-        ]
-    }
-
-
-class BefungeLexer(RegexLexer):
+    # use different colors for different instruction types; the whole
+    # source is tokenized by this single pattern
+    _scan_re = re.compile(r'(\[)|(\])|([.,]+)|([+-]+)|([<>]+)|'
+                          r'([^.,+\-<>\[\]]+)')
+    _group_types = (None, None, None, Name.Tag, Name.Builtin, Name.Variable,
+                    Comment)
+
+    def get_tokens_unprocessed(self, text):
+        depth = 0
+        for match in self._scan_re.finditer(text):
+            group = match.lastindex
+            if group == 1:
+                depth += 1
+                yield match.start(), Keyword, u'['
+            elif group == 2:
+                if depth:
+                    depth -= 1
+                    yield match.start(), Keyword, u']'
+                else:
+                    # unbalanced loop end
+                    yield match.start(), Error, u']'
+            else:
+                yield match.start(), self._group_types[group], match.group()
+
+
+class BefungeLexer(Lexer):
     """
     Lexer for the esoteric `Befunge <http://en.wikipedia.org/wiki/Befunge>`_
     language.
@@ -61,22 +67,57 @@ class BefungeLexer(RegexLexer):
     filenames = ['*.befunge']
     mimetypes = ['application/x-befunge']
 
-    tokens = {
-        'root': [
-            (r'[0-9a-f]', Number),
-            (r'[+*/%!`-]', Operator),             # Traditional math
-            (r'[<>^v?\[\]rxjk]', Name.Variable),  # Move, imperatives
-            (r'[:\\$.,n]', Name.Builtin),         # Stack ops, imperatives
-            (r'[|_mw]', Keyword),
-            (r'[{}]', Name.Tag),                  # Befunge-98 stack ops
-            (r'".*?"', String.Double),            # Strings don't appear to allow escapes
-            (r'\'.', String.Single),              # Single character
-            (r'[#;]', Comment),                   # Trampoline... depends on direction hit
-            (r'[pg&~=@iotsy]', Keyword),          # Misc
-            (r'[()A-Z]', Comment),                # Fingerprints
-            (r'\s+', Text),                       # Whitespace doesn't matter
-        ],
-    }
+    # nearly all tokens are single characters, so they are looked up in a
+    # table; earlier entries take precedence
+    _char_types = {}
+    for _chars, _ttype in [
+            ('0123456789abcdef', Number),
+            ('+*/%!`-', Operator),              # Traditional math
+            ('<>^v?[]rxjk', Name.Variable),     # Move, imperatives
+            (':\\$.,n', Name.Builtin),          # Stack ops, imperatives
+            ('|_mw', Keyword),
+            ('{}', Name.Tag),                   # Befunge-98 stack ops
+            ('#;', Comment),                    # Trampoline... depends on direction hit
+            ('pg&~=@iotsy', Keyword),           # Misc
+            ('()ABCDEFGHIJKLMNOPQRSTUVWXYZ', Comment),  # Fingerprints
+    ]:
+        for _char in _chars:
+            _char_types.setdefault(_char, _ttype)
+    del _chars, _ttype, _char
+
+    _string_re = re.compile(r'".*?"')     # Strings don't appear to allow escapes
+    _space_re = re.compile(r'\s+')        # Whitespace doesn't matter
+
+    def get_tokens_unprocessed(self, text):
+        char_types = self._char_types
+        pos = 0
+        end = len(text)
+        while pos < end:
+            char = text[pos]
+            ttype = char_types.get(char)
+            if ttype is not None:
+                yield pos, ttype, char
+                pos += 1
+                continue
+            match = None
+            if char == '"':
+                match = self._string_re.match(text, pos)
+                ttype = String.Double
+            elif char == "'":
+                # Single character
+                if pos + 1 < end and text[pos + 1] != '\n':
+                    yield pos, String.Single, text[pos:pos + 2]
+                    pos += 2
+                    continue
+            else:
+                match = self._space_re.match(text, pos)
+                ttype = Text
+            if match:
+                yield pos, ttype, match.group()
+                pos = match.end()
+            else:
+                yield pos, Error, char
+                pos += 1
 
 
 class CAmkESLexer(RegexLexer):
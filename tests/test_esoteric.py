@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+    Tests for esoteric language lexers
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2006-2015 by the Pygments team, see AUTHORS.
+    :license: BSD, see LICENSE for details.
+"""
+
+import unittest
+
+from pygments.token import Token
+from pygments.lexers.esoteric import BefungeLexer, BrainfuckLexer, \
+    CAmkESLexer, RedcodeLexer
+
+
+class BrainfuckTest(unittest.TestCase):
+    def setUp(self):
+        self.lexer = BrainfuckLexer()
+
+    def testLoops(self):
+        fragment = u'+[>[-]<]] x.\n'
+        expected = [
+            (Token.Name.Builtin, u'+'),
+            (Token.Keyword, u'['),
+            (Token.Name.Variable, u'>'),
+            (Token.Keyword, u'['),
+            (Token.Name.Builtin, u'-'),
+            (Token.Keyword, u']'),
+            (Token.Name.Variable, u'<'),
+            (Token.Keyword, u']'),
+            (Token.Error, u']'),
+            (Token.Comment, u' x'),
+            (Token.Name.Tag, u'.'),
+            (Token.Comment, u'\n'),
+        ]
+        self.assertEqual(expected, list(self.lexer.get_tokens(fragment)))
+
+
+class BefungeTest(unittest.TestCase):
+    def setUp(self):
+        self.lexer = BefungeLexer()
+
+    def testTokens(self):
+        fragment = u'"hi"\'a9+v "x\n'
+        expected = [
+            (Token.Literal.String.Double, u'"hi"'),
+            (Token.Literal.String.Single, u"'a"),
+            (Token.Literal.Number, u'9'),
+            (Token.Operator, u'+'),
+            (Token.Name.Variable, u'v'),
+            (Token.Text, u' '),
+            (Token.Error, u'"'),
+            (Token.Name.Variable, u'x'),
+            (Token.Text, u'\n'),
+        ]
+        self.assertEqual(expected, list(self.lexer.get_tokens(fragment)))
+
+
+class RedcodeTest(unittest.TestCase):
+    def setUp(self):
+        self.lexer = RedcodeLexer()
+
+    def testIdentifiers(self):
+        fragment = u'x MOV.AB #1, MOVE\n1MOV 1F\n'
+        expected = [
+            (Token.Error, u'x'),
+            (Token.Text, u' '),
+            (Token.Name.Function, u'MOV'),
+            (Token.Punctuation, u'.'),
+            (Token.Name.Decorator, u'AB'),
+            (Token.Text, u' '),
+            (Token.Operator, u'#'),
+            (Token.Literal.Number.Integer, u'1'),
+            (Token.Punctuation, u','),
+            (Token.Text, u' '),
+            (Token.Name, u'MOVE'),
+            (Token.Text, u'\n'),
+            (Token.Literal.Number.Integer, u'1'),
+            (Token.Name, u'MOV'),
+            (Token.Text, u' '),
+            (Token.Literal.Number.Integer, u'1'),
+            (Token.Error, u'F'),
+            (Token.Text, u'\n'),
+        ]
+        self.assertEqual(expected, list(self.lexer.get_tokens(fragment)))
+
+
+class CAmkESTest(unittest.TestCase):
+    def setUp(self):
+        self.lexer = CAmkESLexer()
+
+    def testIdentifiers(self):
+        fragment = (u'to in int dma_pool from_access thread_priority '
+                    u'True foo\n')
+        expected = [
+            (Token.Keyword, u'to'),
+            (Token.Text, u' '),
+            (Token.Keyword.Type, u'in'),
+            (Token.Text, u' '),
+            (Token.Keyword.Type, u'int'),
+            (Token.Text, u' '),
+            (Token.Keyword.Reserved, u'dma_pool'),
+            (Token.Text, u' '),
+            (Token.Keyword.Reserved, u'from_access'),
+            (Token.Text, u' '),
+            (Token.Keyword.Reserved, u'thread_priority'),
+            (Token.Text, u' '),
+            (Token.Name.Builtin, u'True'),
+            (Token.Text, u' '),
+            (Token.Name, u'foo'),
+            (Token.Text, u'\n'),
+        ]
+        self.assertEqual(expected, list(self.lexer.get_tokens(fragment)))
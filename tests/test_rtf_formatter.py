@@ -13,6 +13,8 @@ from string_asserts import StringTests
 from pygments.util import StringIO
 from pygments.formatters import RtfFormatter
 from pygments.lexers.special import TextLexer
+from pygments.lexers.python import PythonLexer
+from pygments.styles import get_style_by_name
 
 class RtfFormatterTest(StringTests, unittest.TestCase):
     foot = (r'\par' '\n' r'}')
@@ -107,3 +109,24 @@ class RtfFormatterTest(StringTests, unittest.TestCase):
             return(unittest.skip('RTF Footer incorrect'))
         msg = self._build_message(t=t, result=result, expected=expected)
         self.assertEndsWith(result, expected+self.foot, msg)
+
+    def test_newlines(self):
+        t = u'a\\\n}\nb'
+        result = self.format_rtf(t)
+        expected = (r'a\\\par' '\n' r'\}\par' '\n' r'b')
+        if not result.endswith(self.foot):
+            return(unittest.skip('RTF Footer incorrect'))
+        msg = self._build_message(t=t, result=result, expected=expected)
+        self.assertEndsWith(result, expected+self.foot, msg)
+
+    def test_style_change(self):
+        t = u'def f(): pass\n'
+        tokensource = list(PythonLexer().get_tokens(t))
+        fmt = RtfFormatter()
+        fmt.format(tokensource, StringIO())
+        fmt.style = get_style_by_name('bw')
+        result = StringIO()
+        fmt.format(tokensource, result)
+        expected = StringIO()
+        RtfFormatter(style='bw').format(tokensource, expected)
+        self.assertEqual(expected.getvalue(), result.getvalue())